@@ -1,5 +1,5 @@
 import unittest
-from trade_log_formatter.py import consolidate_trades, match_trades_fifo
+from trade_log_formatter import consolidate_trades, match_trades_fifo, extract_trades_from_section
 import pandas as pd
 
 class TestTradeFormatter(unittest.TestCase):
@@ -55,6 +55,34 @@ class TestTradeFormatter(unittest.TestCase):
         self.assertEqual(crwd_buys[0]['Quantity'], 5)
         self.assertEqual(crwd_buys[0]['Price'], 449.8)
 
+    def test_extract_trades_from_section(self):
+        section = "\n".join([
+            "U***1234", "IONQ", "2025-05-02, 09:46:11", "2025-05-05", "-",
+            "BUY", "60", "28.5", "-1,710.00", "-1.00", "0", "O",
+            "U***1234", "UNH 16JAN26 550 C", "2025-05-02, 10:15:00", "2025-05-05", "-",
+            "SELL", "-1", "2.35", "235.00", "-0.65", "0", "C",
+            "U***1234", "Total IONQ", "2025-05-02, 15:59:16", "2025-05-05", "-",
+            "SELL", "-125", "30.905", "3,863.13", "-1.00", "0", "",
+        ])
+        
+        trades = extract_trades_from_section(section)
+        
+        # Total lines are skipped
+        self.assertEqual(len(trades), 2)
+        self.assertEqual(trades[0], {
+            "Symbol": "IONQ",
+            "Date": "2025-05-02",
+            "Time": "09:46:11",
+            "Quantity": 60,
+            "Price": 28.5,
+            "Side": "BUY"
+        })
+        
+        # Options keep the full symbol and are priced per contract
+        self.assertEqual(trades[1]['Symbol'], "UNH 16JAN26 550 C")
+        self.assertEqual(trades[1]['Quantity'], -1)
+        self.assertAlmostEqual(trades[1]['Price'], 235.0)
+
     def test_match_trades_fifo(self):
         # Create empty master DataFrame
         df_master = pd.DataFrame(columns=[
@@ -63,24 +91,30 @@ class TestTradeFormatter(unittest.TestCase):
             "Exit Time", "Exit Date"
         ])
         
-        # Test matching
-        result = match_trades_fifo(df_master, self.test_trades)
+        # Test matching on consolidated trades, as update_master_sheet passes them
+        result = match_trades_fifo(df_master, consolidate_trades(self.test_trades))
         
         # Verify IONQ positions
         ionq_trades = result[result['Symbol'] == 'IONQ']
-        self.assertEqual(len(ionq_trades), 2)  # Should have 2 IONQ trades
+        self.assertEqual(len(ionq_trades), 3)  # Closed long, covered short, open long
+        
+        # Columns: Qty, Exit Qty, Exit Price
+        ionq_values = ionq_trades[['Qty', 'Exit Qty', 'Exit Price']].to_numpy()
         
         # First IONQ trade should be fully closed
-        first_ionq = ionq_trades.iloc[0]
-        self.assertEqual(first_ionq['Qty'], 60)
-        self.assertEqual(first_ionq['Exit Qty'], -60)
-        self.assertEqual(first_ionq['Exit Price'], 30.905)
+        self.assertEqual(ionq_values[0, 0], 60)
+        self.assertEqual(ionq_values[0, 1], -60)
+        self.assertEqual(ionq_values[0, 2], 30.905)
+        
+        # Second IONQ trade is the 65-share short, covered by the next day's buy
+        self.assertEqual(ionq_values[1, 0], -65)
+        self.assertEqual(ionq_values[1, 1], 65)
+        self.assertEqual(ionq_values[1, 2], 30.4)
         
-        # Second IONQ trade should be partially closed
-        second_ionq = ionq_trades.iloc[1]
-        self.assertEqual(second_ionq['Qty'], -65)
-        self.assertEqual(second_ionq['Exit Qty'], 65)
-        self.assertEqual(second_ionq['Exit Price'], 30.4)
+        # Third IONQ trade is the rest of that buy, still open
+        self.assertEqual(ionq_values[2, 0], 35)
+        self.assertTrue(pd.isna(ionq_values[2, 1]))
+        self.assertTrue(pd.isna(ionq_values[2, 2]))
 
     def test_balance_calculation(self):
         df_master = pd.DataFrame(columns=[
@@ -89,18 +123,16 @@ class TestTradeFormatter(unittest.TestCase):
             "Exit Time", "Exit Date"
         ])
         
-        result = match_trades_fifo(df_master, self.test_trades)
+        # match_trades_fifo takes consolidated LONG/SHORT trades, as update_master_sheet passes them
+        result = match_trades_fifo(df_master, consolidate_trades(self.test_trades))
         
         # Get final balances for each symbol
-        balances = {}
-        for _, row in result.iterrows():
-            symbol = row['Symbol']
-            qty = row['Qty']
-            exit_qty = row['Exit Qty'] if pd.notna(row['Exit Qty']) else 0
-            
-            if symbol not in balances:
-                balances[symbol] = 0
-            balances[symbol] += qty + (exit_qty if exit_qty else 0)
+        balances = (
+            (result['Qty'].fillna(0) + result['Exit Qty'].fillna(0))
+            .groupby(result['Symbol'], sort=False)
+            .sum()
+            .to_dict()
+        )
         
         # Test final balances
         self.assertEqual(balances['IONQ'], 35)  # Should have 35 shares remaining
@@ -2,24 +2,81 @@ import pandas as pd
 import re
 import json
 import os
+import glob
+import shutil
 from datetime import datetime, timedelta
-from glob import glob
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF for PDF processing
-import csv
 
 # Configuration
 DEBUG = False  # Set to False to enable debug printing
+# Read the clock once at startup
+today = datetime.now()
 # Set default test date to yesterday
-yesterday = datetime.now() - timedelta(days=1)
+yesterday = today - timedelta(days=1)
 # DEFAULT_TEST_DATE = datetime.now().strftime("%m.%Y")
 
 # Add at the top with other configurations
 TEST_MODE = False  # Set to True to use test files
-DEFAULT_TEST_DATE = "06.2025" if TEST_MODE else datetime.now().strftime("%m.%Y")
+DEFAULT_TEST_DATE = "06.2025" if TEST_MODE else f"{today:%m.%Y}"
 MASTER_FILE = "master-copy-test.xlsx" if TEST_MODE else "master-trades.xlsx"
 MASTER_BACKUP = "master-copy-test-backup.xlsx" if TEST_MODE else "master-copy-backup.xlsx"
 PROCESSED_FILE = "processed_files_test.json" if TEST_MODE else "processed_files.json"
 BASE_PATH = "/Users/michaeljacinto/Library/CloudStorage/OneDrive-Personal/Desktop/trades"
+MAX_PDF_WORKERS = 4  # Parallel PDF parsing stops paying off past a few processes
+MIN_PDFS_FOR_POOL = 4  # Spawning workers costs far more than parsing a few reports inline
+
+# Trade line pattern, compiled once at import (handles options symbols)
+TRADE_LINE_RE = re.compile(r"""
+    U\*\*\*\d+\s+               # Account ID (masked)
+    (?P<symbol>[A-Z\s\d]+)\s+   # Symbol (including options)
+    (?P<trade_date>\d{4}-\d{2}-\d{2}),?\s*  # Trade Date (optional comma)
+    (?P<trade_time>\d{2}:\d{2}:\d{2})\s*    # Trade Time
+    (?P<settle_date>\d{4}-\d{2}-\d{2})\s*   # Settle Date
+    [-\s]*                      # Exchange separator
+    (?P<type>BUY|SELL)\s*      # Trade Type
+    (?P<quantity>-?\d+)\s*      # Quantity (allowing negative numbers)
+    (?P<price>\d+\.?\d*)\s*     # Price
+    [-\d.,\s]*                  # Proceeds
+""", re.VERBOSE | re.IGNORECASE)
+
+# Sub-patterns used to explain why a line failed to match TRADE_LINE_RE
+PARSE_FAILURE_CHECKS = [
+    (check_name, re.compile(check_pattern)) for check_name, check_pattern in [
+        ("Account ID", r"U\*\*\*\d+"),
+        ("Symbol", r"[A-Z\s\d]+"),
+        ("Trade Date", r"\d{4}-\d{2}-\d{2}"),
+        ("Time", r"\d{2}:\d{2}:\d{2}"),
+        ("Trade Type", r"BUY|SELL"),
+        ("Quantity", r"-?\d+"),
+        ("Price", r"\d+\.?\d*")
+    ]
+]
+
+# A trade in the PDF report text is one field per line, starting at the masked account ID.
+# Matched against the raw page text: fields may carry surrounding whitespace and be
+# separated by blank lines ([^\S\n] is whitespace other than a newline)
+PDF_TRADE_RE = re.compile(r"""
+    ^[^\S\n]*U\*\*\*.*\n                                  # Account ID (masked)
+    \s*(?P<symbol>\S(?:.*\S)?)[^\S\n]*\n                  # Symbol (including options)
+    \s*(?P<trade_date>\d{4}-\d{2}-\d{2}),[^\S\n]*         # Trade Date
+    (?P<trade_time>\d{2}:\d{2}:\d{2}).*\n                 # Trade Time
+    \s*\S.*\n                                             # Settle Date
+    \s*\S.*\n                                             # Exchange
+    \s*(?P<type>[A-Za-z]+)[^\S\n]*\n                      # Trade Type
+    \s*(?P<quantity>-?\d+)[^\S\n]*\n                      # Quantity (allowing negative numbers)
+    \s*(?P<price>-?\d+(?:\.\d+)?)[^\S\n]*$                # Price
+""", re.VERBOSE | re.MULTILINE)
+
+# Daily broker report file name; the date group sorts chronologically as a string
+REPORT_FILENAME_RE = re.compile(r'DailyTradeReport\.(\d{8})\.pdf$')
+
+# Option symbols look like: UNH 16JAN26 550 C
+OPTION_SYMBOL_RE = re.compile(r'[A-Z]+\s+\d+[A-Z]{3}\d{2}\s+\d+\s+[CP]')
+
+# Column order of a parsed trade record
+TRADE_COLUMNS = ["Symbol", "Date", "Time", "Quantity", "Price", "Side"]
 
 def debug_print(*args, **kwargs):
     """Wrapper for debug printing"""
@@ -30,8 +87,9 @@ def get_folder_path(date_str):
     """Find folder containing the input month-year"""
     try:
         # Parse input date string (e.g., 05.2025)
+        # strptime validates it and the re-format zero-pads the month (5.2025 -> 05.2025)
         target_date = datetime.strptime(date_str, "%m.%Y")
-        target_folder = target_date.strftime("%m.%Y")
+        target_folder = f"{target_date:%m.%Y}"
         
         # Look for exact month folder
         folder_path = os.path.join(BASE_PATH, target_folder)
@@ -47,40 +105,21 @@ def get_folder_path(date_str):
         raise ValueError("Invalid date format. Please use MM.YYYY (e.g., 05.2025)")
 
 
+def explain_parse_failure(line):
+    """Print which trade fields are missing from a line that failed to parse"""
+    print("\n  🔍 Pattern match failure analysis:")
+    for check_name, check_pattern in PARSE_FAILURE_CHECKS:
+        if not check_pattern.search(line):
+            print(f"    ❌ Missing {check_name}")
+    print(f"    📝 Raw text: {line[:100]}...")
+
 def parse_trade_line(line):
     """Parse a single trade line from PDF report"""
-    # Updated pattern to handle options symbols
-    pattern = re.compile(r"""
-        U\*\*\*\d+\s+               # Account ID (masked)
-        (?P<symbol>[A-Z\s\d]+)\s+   # Symbol (including options)
-        (?P<trade_date>\d{4}-\d{2}-\d{2}),?\s*  # Trade Date (optional comma)
-        (?P<trade_time>\d{2}:\d{2}:\d{2})\s*    # Trade Time
-        (?P<settle_date>\d{4}-\d{2}-\d{2})\s*   # Settle Date
-        [-\s]*                      # Exchange separator
-        (?P<type>BUY|SELL)\s*      # Trade Type
-        (?P<quantity>-?\d+)\s*      # Quantity (allowing negative numbers)
-        (?P<price>\d+\.?\d*)\s*     # Price
-        [-\d.,\s]*                  # Proceeds
-    """, re.VERBOSE | re.IGNORECASE)
-
-    match = pattern.search(line)
+    match = TRADE_LINE_RE.search(line)
     if not match:
-        # Analyze why the pattern failed to match
-        checks = [
-            ("Account ID", r"U\*\*\*\d+"),
-            ("Symbol", r"[A-Z\s\d]+"),
-            ("Trade Date", r"\d{4}-\d{2}-\d{2}"),
-            ("Time", r"\d{2}:\d{2}:\d{2}"),
-            ("Trade Type", r"BUY|SELL"),
-            ("Quantity", r"-?\d+"),
-            ("Price", r"\d+\.?\d*")
-        ]
-        
-        print("\n  🔍 Pattern match failure analysis:")
-        for check_name, check_pattern in checks:
-            if not re.search(check_pattern, line):
-                print(f"    ❌ Missing {check_name}")
-        print(f"    📝 Raw text: {line[:100]}...")
+        # Only diagnose lines that look like trades (start with the account ID)
+        if DEBUG and line.lstrip().startswith('U***'):
+            explain_parse_failure(line)
         return None
 
     trade_data = {
@@ -96,235 +135,176 @@ def parse_trade_line(line):
 
 def is_option_trade(symbol):
     """Check if the trade is an options trade by looking for date pattern after symbol"""
-    # Match pattern like: UNH 16JAN26 550 C
-    return bool(re.search(r'[A-Z]+\s+\d+[A-Z]{3}\d{2}\s+\d+\s+[CP]', symbol))
+    # Plain stock symbols have no spaces, so most trades skip the regex entirely
+    return ' ' in symbol and OPTION_SYMBOL_RE.search(symbol) is not None
 
-def extract_trades_from_pdf(file_path):
-    """Extract all trades from a PDF file and show summary"""
+def extract_trades_from_section(text):
+    """Extract all trades from one section of report text"""
     trades = []
-    try:
-        doc = fitz.open(file_path)
-        print(f"\n📄 Processing: {os.path.basename(file_path)} ({len(doc)} pages)")
-        
-        # Process ALL pages
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            debug_print(f"  📄 Processing page {page_num + 1}")
-            
-            # Check if this page has any trade data
-            if 'U***' not in text:
-                debug_print(f"    ⏭️ No trade data found on page {page_num + 1}")
-                continue
-            
-            # For first page, look for USD sections
-            # For subsequent pages, process the entire page as continuation
-            if page_num == 0:
-                # Look for USD sections on first page only
-                sections = text.split('USD')
-                
-                if len(sections) <= 1:
-                    debug_print(f"    ⏭️ No USD sections found on page {page_num + 1}")
-                    continue
-                
-                # Process each USD section (skip the first split which is before first USD)
-                sections_to_process = sections[1:]
-            else:
-                # For continuation pages, process the entire page content
-                debug_print(f"    📋 Processing continuation page {page_num + 1}")
-                sections_to_process = [text]  # Process entire page as one section
-            
-            # Process sections
-            for section_num, section in enumerate(sections_to_process, 1):
-                if page_num == 0:
-                    debug_print(f"    📋 Processing USD section {section_num} on page {page_num + 1}")
-                else:
-                    debug_print(f"    📋 Processing continuation content on page {page_num + 1}")
-                
-                # End processing at Financial Instrument Information if found
-                if 'Financial Instrument Information' in section:
-                    relevant_text = section.split('Financial Instrument Information')[0]
-                else:
-                    relevant_text = section
-                
-                lines = [line.strip() for line in relevant_text.splitlines() if line.strip()]
-                
-                if not lines:
-                    debug_print(f"      ⏭️ No lines found in section")
-                    continue
-                
-                i = 0
-                trades_found_in_section = 0
-                while i < len(lines):
-                    if lines[i].startswith('U***'):
-                        try:
-                            # Make sure we have enough lines
-                            if i + 7 >= len(lines):
-                                debug_print(f"      ⚠️ Not enough lines for trade at line {i}")
-                                i += 1
-                                continue
-                                
-                            # Extract trade data from lines
-                            account = lines[i]
-                            symbol = lines[i+1]     # This might be an option symbol
-                            datetime = lines[i+2]
-                            trade_type = lines[i+5].strip().upper()
-                            quantity = lines[i+6]
-                            price = lines[i+7]
-                            
-                            # Skip if this is a Total line
-                            if "Total" not in symbol:
-                                # Keep full symbol if it's an option
-                                is_option = is_option_trade(symbol)
-                                trade_symbol = symbol if is_option else symbol.split()[0]
-                                
-                                # For options, multiply price by 100
-                                raw_price = float(price.strip())
-                                adjusted_price = raw_price * 100 if is_option else raw_price
-                                
-                                trade_data = {
-                                    "Symbol": trade_symbol,
-                                    "Date": datetime.split(',')[0],
-                                    "Time": datetime.split(',')[1].strip(),
-                                    "Quantity": int(quantity.strip()),
-                                    "Price": adjusted_price,
-                                    "Side": trade_type
-                                }
-                                
-                                debug_print(f"      ✅ Parsed Trade: {'LONG' if trade_data['Side'] == 'BUY' else 'SHORT'} {trade_data['Quantity']} "
-                                          f"{trade_data['Symbol']} @ ${trade_data['Price']:.2f} "
-                                          f"({'Option' if is_option else 'Stock'}) [Page {page_num + 1}]")
-                                
-                                trades.append(trade_data)
-                                trades_found_in_section += 1
-                            
-                            # Skip to next potential transaction
-                            i += 12
-                        except (IndexError, ValueError) as e:
-                            debug_print(f"      ⚠️ Error parsing trade at line {i} on page {page_num + 1}")
-                            debug_print(f"      ⚠️ Error details: {str(e)}")
-                            debug_print(f"      ⚠️ Current line content: {lines[i] if i < len(lines) else 'EOF'}")
-                            i += 1
-                    else:
-                        i += 1
-                
-                debug_print(f"    📊 Found {trades_found_in_section} trades on page {page_num + 1}")
+    for match in PDF_TRADE_RE.finditer(text):
+        symbol = match.group("symbol")  # This might be an option symbol
+        
+        # Skip if this is a Total line
+        if "Total" in symbol:
+            continue
+        
+        # Keep full symbol if it's an option
+        is_option = is_option_trade(symbol)
+        trade_symbol = symbol if is_option else symbol.partition(' ')[0]
         
-        # Add summary at the end of each PDF
+        # For options, multiply price by 100
+        raw_price = float(match.group("price"))
+        adjusted_price = raw_price * 100 if is_option else raw_price
+        
+        trade_data = {
+            "Symbol": trade_symbol,
+            "Date": match.group("trade_date"),
+            "Time": match.group("trade_time"),
+            "Quantity": int(match.group("quantity")),
+            "Price": adjusted_price,
+            "Side": match.group("type").upper()
+        }
+        
+        # Guard here rather than via debug_print so the f-string is not built per trade
         if DEBUG:
-            print("\n  📊 Debug Summary of Trades:")
-            if trades:
-                # Group trades by symbol and side
-                buys = {}
-                sells = {}
-                
-                # Debug the trade sorting
-                debug_print("\n  🔍 Sorting trades:")
-                for trade in trades:
-                    symbol = trade['Symbol']
-                    side = trade['Side']
-                    debug_print(f"    Trade: {symbol} {side} {trade['Quantity']} @ {trade['Price']}")
-                    
-                    # Determine target dictionary based on trade side
-                    if side == "SELL":
-                        target_dict = sells
-                    else:
-                        target_dict = buys
-                    
-                    if symbol not in target_dict:
-                        target_dict[symbol] = {
-                            'qty': 0,
-                            'total_cost': 0,
-                            'earliest_time': trade['Time']
-                        }
-                    
-                    current = target_dict[symbol]
-                    current['qty'] += trade['Quantity']
-                    current['total_cost'] += trade['Quantity'] * trade['Price']
-                    current['earliest_time'] = min(current['earliest_time'], trade['Time'])
-                    
-                    debug_print(f"    Added to {'SELLS' if side == 'SELL' else 'BUYS'}, "
-                            f"New total: {current['qty']} @ {current['total_cost']/current['qty']:.2f}")
-                
-                # Print summary
-                print("\n  📊 PDF Summary:")
-                pdf_total = 0
-                
-                # Print LONG summary
-                if buys:
-                    print("\n  🟢 LONG:")  # Changed from BUYS
-                    print("  Symbol  Shares    Avg Price    Total Value    Time")
-                    print("  " + "-" * 55)
-                    
-                    for symbol, data in buys.items():
-                        if data['qty'] > 0:
-                            avg_price = data['total_cost'] / data['qty']
-                            total_value = data['total_cost']
-                            pdf_total += total_value
-                            
-                            print(f"  {symbol:6} {data['qty']:8.0f} @ ${avg_price:8,.2f} = ${total_value:11,.2f}  {data['earliest_time']}")
-                    
-                    print("  " + "-" * 55)
-                
-                # Print SHORT summary
-                if sells:
-                    print("\n  🔴 SHORT:")  # Changed from SELLS
-                    print("  Symbol  Shares    Avg Price    Total Value    Time")
-                    print("  " + "-" * 55)
-                    
-                    for symbol, data in sells.items():
-                        if data['qty'] < 0:
-                            avg_price = data['total_cost'] / data['qty']
-                            total_value = data['total_cost']
-                            pdf_total += total_value
-                            
-                            print(f"  {symbol:6} {data['qty']:8.0f} @ ${avg_price:8,.2f} = ${total_value:11,.2f}  {data['earliest_time']}")
-                    
-                    print("  " + "-" * 55)
-                
-                print(f"  PDF Total Value: ${pdf_total:,.2f}\n")
+            print(f"      ✅ Parsed Trade: {'LONG' if trade_data['Side'] == 'BUY' else 'SHORT'} {trade_data['Quantity']} "
+                  f"{trade_data['Symbol']} @ ${trade_data['Price']:.2f} "
+                  f"({'Option' if is_option else 'Stock'})")
+        
+        trades.append(trade_data)
+    
+    return trades
+
+def extract_trades_from_pdf(file_path):
+    """Extract all trades from a PDF file; returns [] on error"""
+    trades = []
+    try:
+        # Read ALL pages as one text so trades spanning a page break are kept together;
+        # the context manager closes the document even if a page fails to decode
+        with fitz.open(file_path) as doc:
+            full_text = "\n".join(page.get_text() for page in doc)
         
-        doc.close()
+        # Trades follow the first USD section header and end at Financial Instrument Information
+        _, usd_header, trade_text = full_text.partition('USD')
+        if usd_header:
+            trade_text = trade_text.partition('Financial Instrument Information')[0]
+            trades = extract_trades_from_section(trade_text)
         
     except Exception as e:
         print(f"❌ Error processing {file_path}: {str(e)}")
     
     return trades
 
+def print_pdf_summary(trades):
+    """Print the debug summary of one PDF's trades (only called when DEBUG is on)"""
+    print("\n  📊 Debug Summary of Trades:")
+    if trades:
+        # Group trades by side and symbol; running totals and the summary both come from groupby
+        df = pd.DataFrame(trades, columns=TRADE_COLUMNS)
+        df['Book'] = df['Side'].eq('SELL').map({True: 'SELLS', False: 'BUYS'})
+        df['notional'] = df['Quantity'] * df['Price']
+        groups = df.groupby(['Book', 'Symbol'], sort=False)
+        running = groups[['Quantity', 'notional']].cumsum()
+        
+        # Debug the trade sorting
+        print("\n  🔍 Sorting trades:")
+        for symbol, side, qty, price, book, running_qty, running_cost in zip(
+            df['Symbol'], df['Side'], df['Quantity'], df['Price'], df['Book'],
+            running['Quantity'], running['notional']
+        ):
+            print(f"    Trade: {symbol} {side} {qty} @ {price}")
+            print(f"    Added to {book}, "
+                  f"New total: {running_qty} @ {running_cost/running_qty:.2f}")
+        
+        summary = groups.agg(qty=('Quantity', 'sum'), total_cost=('notional', 'sum'), earliest_time=('Time', 'min'))
+        
+        # Print summary
+        print("\n  📊 PDF Summary:")
+        pdf_total = 0
+        
+        # LONG rows are the BUYS book with a positive total, SHORT rows the SELLS book with a negative one
+        for book, label, shown in (("BUYS", "🟢 LONG", lambda q: q > 0), ("SELLS", "🔴 SHORT", lambda q: q < 0)):
+            if book not in summary.index.get_level_values('Book'):
+                continue
+            
+            print(f"\n  {label}:")
+            print("  Symbol  Shares    Avg Price    Total Value    Time")
+            print("  " + "-" * 55)
+            
+            for data in summary.loc[book].itertuples():
+                if shown(data.qty):
+                    avg_price = data.total_cost / data.qty
+                    pdf_total += data.total_cost
+                    
+                    print(f"  {data.Index:6} {data.qty:8.0f} @ ${avg_price:8,.2f} = ${data.total_cost:11,.2f}  {data.earliest_time}")
+            
+            print("  " + "-" * 55)
+        
+        print(f"  PDF Total Value: ${pdf_total:,.2f}\n")
+
+def extract_trades_from_pdfs(pdf_paths):
+    """Yield the trades of each PDF in input order, using a process pool only for larger batches"""
+    if len(pdf_paths) < MIN_PDFS_FOR_POOL:
+        # The usual daily run has one new report; parse it in this process
+        yield from map(extract_trades_from_pdf, pdf_paths)
+        return
+    
+    # PDF parsing is CPU-bound and independent per file, so spread a backlog over processes;
+    # map() yields results in input order, which keeps trades chronological
+    with ProcessPoolExecutor(max_workers=min(len(pdf_paths), os.cpu_count() or 1, MAX_PDF_WORKERS)) as executor:
+        yield from executor.map(extract_trades_from_pdf, pdf_paths)
+
 def gather_all_trades(folder):
-    """Gather trades from all PDFs in chronological order"""
+    """Gather trades from all new PDFs in chronological order; returns (trades, new report file names)"""
     all_trades = []
-    # Get all PDF files and sort them by date in filename
-    pdf_files = glob(os.path.join(folder, "DailyTradeReport.*.pdf"))
-    
-    # Sort PDFs by date in filename (format: DailyTradeReport.YYYYMMDD.pdf)
-    pdf_files.sort(key=lambda x: os.path.basename(x).split('.')[1])
+    # Get all PDF files (format: DailyTradeReport.YYYYMMDD.pdf) and sort them by the date
+    # in the filename; one directory scan, no per-file stat
+    with os.scandir(folder) as entries:
+        dated_reports = [
+            (match.group(1), entry.path) for entry in entries
+            if (match := REPORT_FILENAME_RE.match(entry.name)) and entry.is_file()
+        ]
+    dated_reports.sort()
+    pdf_files = [path for _, path in dated_reports]
     
     processed_files = manage_processed_files(folder, check_only=True)
     
-    new_files = False
+    new_pdfs = []
     for pdf in pdf_files:
         filename = os.path.basename(pdf)
         if filename in processed_files:
             debug_print(f"⏭️  Skipping previously processed file: {filename}")
             continue
-            
-        new_files = True
-        debug_print(f"\n📅 Processing {filename}")
-        trades = extract_trades_from_pdf(pdf)
-        all_trades.extend(trades)
-        
-        # Mark file as processed
-        manage_processed_files(folder, filename)
+        new_pdfs.append(pdf)
     
-    if not new_files:
+    if not new_pdfs:
         print("\n📝 No new trade reports to process")
+        return build_trades_frame(all_trades), []
+    
+    newly_processed = []
+    for pdf, trades in zip(new_pdfs, extract_trades_from_pdfs(new_pdfs)):
+        filename = os.path.basename(pdf)
+        # Report here, not in the parser, so output follows file order even from the pool
+        print(f"\n📄 Processed: {filename} ({len(trades)} trades)")
+        if DEBUG:
+            print_pdf_summary(trades)
+        all_trades.extend(trades)
+        newly_processed.append(filename)
     
-    return all_trades
+    # The caller marks these as processed once their trades are saved
+    return build_trades_frame(all_trades), newly_processed
+
+def build_trades_frame(trades):
+    """Build a typed DataFrame (one column per trade field) from parsed trades"""
+    df = pd.DataFrame(trades, columns=TRADE_COLUMNS)
+    return df.astype({
+        "Quantity": "int64",
+        "Price": "float64"
+    })
 
 def export_to_csv(trades, output_file, folder_path):
     """Export trades to CSV file in the same folder as PDFs"""
-    if not trades:
+    if len(trades) == 0:
         print("No trades found to export.")
         return
 
@@ -333,106 +313,97 @@ def export_to_csv(trades, output_file, folder_path):
     # Create full path for output file in the same folder as PDFs
     output_path = os.path.join(folder_path, output_file)
     
-    with open(output_path, mode='w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(trades)
+    pd.DataFrame(trades, columns=fields).to_csv(output_path, index=False)
 
     print(f"✅ Exported {len(trades)} trades to {output_path}")
 
 def consolidate_trades(trades):
     """Consolidate trades by symbol and date, averaging prices for same-day trades"""
-    consolidated = {}
+    if isinstance(trades, pd.DataFrame):
+        trades = trades.to_dict('records')
     
+    consolidated = {}
     for trade in trades:
-        # Update trade side before creating key
-        trade['Side'] = 'LONG' if trade['Side'] == 'BUY' else 'SHORT'
-        key = (trade['Symbol'], trade['Date'], trade['Side'])
-        
-        if key in consolidated:
-            existing = consolidated[key]
-            # Calculate new total quantity and weighted average price
-            total_qty = existing['Quantity'] + trade['Quantity']
-            weighted_price = (
-                (existing['Quantity'] * existing['Price'] + 
-                 trade['Quantity'] * trade['Price']) / total_qty
-            )
-            
-            # For SHORT orders, keep the latest time
-            # For LONG orders, keep the earliest time
-            if trade['Side'] == 'SHORT':
-                time_to_use = max(existing['Time'], trade['Time'])
-            else:
-                time_to_use = min(existing['Time'], trade['Time'])
-            
+        # Map trade side before creating key; the input trades are left untouched
+        side = 'LONG' if trade['Side'] == 'BUY' else 'SHORT'
+        key = (trade['Symbol'], trade['Date'], side)
+        qty, price, time = trade['Quantity'], trade['Price'], trade['Time']
+        
+        existing = consolidated.get(key)
+        if existing is None:
             consolidated[key] = {
                 'Symbol': trade['Symbol'],
                 'Date': trade['Date'],
-                'Time': time_to_use,
-                'Side': trade['Side'],
-                'Quantity': total_qty,
-                'Price': weighted_price
+                'Time': time,
+                'Quantity': qty,
+                'Price': price,
+                'Side': side
             }
+            continue
+        
+        # Running weighted average, folded fill by fill in file order; summing notional instead
+        # rounds differently, and the price string is part of the keys update_master_sheet dedupes on
+        total_qty = existing['Quantity'] + qty
+        existing['Price'] = (existing['Quantity'] * existing['Price'] + qty * price) / total_qty
+        existing['Quantity'] = total_qty
+        
+        # For SHORT orders, keep the latest time
+        # For LONG orders, keep the earliest time
+        if side == 'SHORT':
+            existing['Time'] = max(existing['Time'], time)
         else:
-            consolidated[key] = trade.copy()
+            existing['Time'] = min(existing['Time'], time)
     
     return list(consolidated.values())
 
-def check_open_positions(folder_path):
+def check_open_positions(folder_path, df_master=None):
     """Check master copy for open positions and provide summary with totals"""
     try:
-        master_file = os.path.join("/Users/michaeljacinto/Library/CloudStorage/OneDrive-Personal/Desktop/trades", MASTER_FILE)
-        df = pd.read_excel(master_file)
+        position_columns = [
+            "Symbol", "Qty", "Side", "Entry Price", "Entry Time",
+            "Entry Date", "Exit Qty", "Exit Price"
+        ]
+        if df_master is not None:
+            # Reuse the sheet update_master_sheet just wrote instead of parsing it again
+            df = df_master.reindex(columns=position_columns)
+        else:
+            master_file = os.path.join("/Users/michaeljacinto/Library/CloudStorage/OneDrive-Personal/Desktop/trades", MASTER_FILE)
+            # Only load the columns the position report uses
+            df = pd.read_excel(master_file, usecols=position_columns)
         
         # Find rows where Exit Qty or Exit Price is empty/NaN
-        open_positions = df[df['Exit Qty'].isna() | df['Exit Price'].isna()]
+        open_mask = df[['Exit Qty', 'Exit Price']].isna().to_numpy().any(axis=1)
+        open_positions = df[open_mask]
         
         if not open_positions.empty:
             print("\n📈 Open Positions (Detail):")
-            for _, row in open_positions.iterrows():
-                position_type = "LONG" if row['Side'] in ['BUY', 'LONG'] else "SHORT"
-                print(f"  • {row['Symbol']}: {row['Qty']} shares ({position_type}) @ ${row['Entry Price']:.2f} "
-                      f"({row['Entry Date']} {row['Entry Time']})")
+            detail_rows = open_positions[['Symbol', 'Qty', 'Side', 'Entry Price', 'Entry Date', 'Entry Time']]
+            for symbol, qty, side, entry_price, entry_date, entry_time in detail_rows.itertuples(index=False, name=None):
+                position_type = "LONG" if side in ['BUY', 'LONG'] else "SHORT"
+                print(f"  • {symbol}: {qty} shares ({position_type}) @ ${entry_price:.2f} "
+                      f"({entry_date} {entry_time})")
             
-            # Create summary by symbol
-            summary = {}
-            grand_total = 0
-            
-            for _, row in open_positions.iterrows():
-                symbol = row['Symbol']
-                qty = row['Qty']
-                price = row['Entry Price']
-                date = pd.to_datetime(row['Entry Date'])
-                
-                if symbol in summary:
-                    existing = summary[symbol]
-                    total_qty = existing['qty'] + qty
-                    weighted_price = (existing['qty'] * existing['price'] + qty * price) / total_qty
-                    earliest_date = min(existing['date'], date)
-                    
-                    summary[symbol] = {
-                        'qty': total_qty,
-                        'price': weighted_price,
-                        'date': earliest_date,
-                        'total_value': total_qty * weighted_price
-                    }
-                else:
-                    summary[symbol] = {
-                        'qty': qty,
-                        'price': price,
-                        'date': date,
-                        'total_value': qty * price
-                    }
+            # Create summary by symbol: weighted average price and earliest entry date
+            summary = (
+                open_positions
+                .assign(
+                    notional=open_positions['Qty'] * open_positions['Entry Price'],
+                    entry_date=pd.to_datetime(open_positions['Entry Date'], format='ISO8601', cache=True)
+                )
+                .groupby('Symbol', sort=False)
+                .agg(qty=('Qty', 'sum'), notional=('notional', 'sum'), date=('entry_date', 'min'))
+            )
+            summary['price'] = summary['notional'] / summary['qty']
+            summary['total_value'] = summary['notional']
+            grand_total = summary['total_value'].sum()
             
             # Print summary with position values
             print("\n📊 Open Positions Summary:")
             print("  Symbol  Shares    Avg Price    Total Value    Since")
             print("  " + "-" * 55)
             
-            for symbol, data in summary.items():
-                position_value = data['total_value']
-                grand_total += position_value
-                print(f"  {symbol:6} {data['qty']:8.0f} @ ${data['price']:8,.2f} = ${position_value:11,.2f}  {data['date'].strftime('%Y-%m-%d')}")
+            for data in summary.itertuples():
+                print(f"  {data.Index:6} {data.qty:8.0f} @ ${data.price:8,.2f} = ${data.total_value:11,.2f}  {data.date.strftime('%Y-%m-%d')}")
             
             print("  " + "-" * 55)
             print(f"  Total Portfolio Value: ${grand_total:,.2f}")
@@ -451,13 +422,16 @@ def check_open_positions(folder_path):
 
 def match_trades_fifo(df_master, consolidated_trades):
     """Match trades using FIFO method with running balance"""
-    positions = {}  # {symbol: {'qty': net_qty, 'trades': []}}
+    # {symbol: {'qty': net_qty, 'trades': [], 'longs': deque(open BUY lots), 'shorts': [open SELL lots]}}
+    positions = {}
     
     # Process trades in chronological order - this is crucial!
     trades = sorted(consolidated_trades, key=lambda x: (x['Date'], x['Time']))
     print("\n🔄 Matching trades using FIFO method...")
-    print("\nTrades to process:")
-    print(json.dumps(trades, indent=2, default=str))
+    # The matching trace is debug output (see README); skip building it otherwise
+    if DEBUG:
+        print("\nTrades to process:")
+        print(json.dumps(trades, indent=2, default=str))
 
     for trade in trades:
         symbol = trade['Symbol']
@@ -468,11 +442,12 @@ def match_trades_fifo(df_master, consolidated_trades):
         date = trade['Date']
         
         if symbol not in positions:
-            positions[symbol] = {'qty': 0, 'trades': []}
+            positions[symbol] = {'qty': 0, 'trades': [], 'longs': deque(), 'shorts': []}
         
         curr_pos = positions[symbol]
-        print(f"\n📊 Processing {side} {qty} {symbol} @ ${price:.2f}")
-        print(f"  Current {symbol} balance: {curr_pos['qty']}")
+        if DEBUG:
+            print(f"\n📊 Processing {side} {qty} {symbol} @ ${price:.2f}")
+            print(f"  Current {symbol} balance: {curr_pos['qty']}")
         
         if side == 'LONG':  # This handles BUY orders
             remaining_qty = qty
@@ -481,19 +456,19 @@ def match_trades_fifo(df_master, consolidated_trades):
             if curr_pos['qty'] < 0:
                 cover_qty = min(qty, abs(curr_pos['qty']))
                 
-                # Find open SHORT positions to close
-                for pos in reversed(curr_pos['trades']):
-                    if pos['Side'] == 'SELL' and (pos['Exit Qty'] is None or pd.isna(pos['Exit Qty'])) and cover_qty > 0:
-                        pos_cover = min(cover_qty, abs(pos['Qty']))
-                        pos['Exit Qty'] = pos_cover
-                        pos['Exit Price'] = price
-                        pos['Exit Time'] = time
-                        pos['Exit Date'] = date
-                        cover_qty -= pos_cover
-                        remaining_qty -= pos_cover
+                # Cover open SHORT positions, most recent first
+                open_shorts = curr_pos['shorts']
+                while open_shorts and cover_qty > 0:
+                    pos = open_shorts.pop()
+                    pos_cover = min(cover_qty, abs(pos['Qty']))
+                    pos['Exit Qty'] = pos_cover
+                    pos['Exit Price'] = price
+                    pos['Exit Time'] = time
+                    pos['Exit Date'] = date
+                    cover_qty -= pos_cover
+                    remaining_qty -= pos_cover
+                    if DEBUG:
                         print(f"  → Covered {pos_cover} shares of SHORT position")
-                        if cover_qty == 0:
-                            break
             
             # Update running balance
             curr_pos['qty'] += qty
@@ -514,20 +489,24 @@ def match_trades_fifo(df_master, consolidated_trades):
                     'Exit Date': None
                 }
                 curr_pos['trades'].append(new_trade)
-                print(f"  → Added LONG position of {remaining_qty} shares")
+                curr_pos['longs'].append(new_trade)
+                if DEBUG:
+                    print(f"  → Added LONG position of {remaining_qty} shares")
             
         elif side == 'SHORT':  # This handles SELL orders
             remaining_sell = qty
             
-            # First try to close existing LONG positions
-            for pos in curr_pos['trades']:
-                if pos['Side'] == 'BUY' and (pos['Exit Qty'] is None or pd.isna(pos['Exit Qty'])) and remaining_sell > 0:
-                    pos_close = min(remaining_sell, pos['Qty'])
-                    pos['Exit Qty'] = -pos_close
-                    pos['Exit Price'] = price
-                    pos['Exit Time'] = time
-                    pos['Exit Date'] = date
-                    remaining_sell -= pos_close
+            # First try to close existing LONG positions, oldest first
+            open_longs = curr_pos['longs']
+            while open_longs and remaining_sell > 0:
+                pos = open_longs.popleft()
+                pos_close = min(remaining_sell, pos['Qty'])
+                pos['Exit Qty'] = -pos_close
+                pos['Exit Price'] = price
+                pos['Exit Time'] = time
+                pos['Exit Date'] = date
+                remaining_sell -= pos_close
+                if DEBUG:
                     print(f"  → Closed {pos_close} shares of LONG position")
             
             # Update running balance
@@ -549,9 +528,12 @@ def match_trades_fifo(df_master, consolidated_trades):
                     'Exit Date': None
                 }
                 curr_pos['trades'].append(new_trade)
-                print(f"  → Added SHORT position of {remaining_sell} shares")
+                curr_pos['shorts'].append(new_trade)
+                if DEBUG:
+                    print(f"  → Added SHORT position of {remaining_sell} shares")
         
-        print(f"  → New {symbol} balance: {curr_pos['qty']}")
+        if DEBUG:
+            print(f"  → New {symbol} balance: {curr_pos['qty']}")
     
     # Convert all trades back to DataFrame
     all_trades = []
@@ -561,9 +543,9 @@ def match_trades_fifo(df_master, consolidated_trades):
     # Sort by date and time
     df_result = pd.DataFrame(all_trades)
     if not df_result.empty:
-        # Convert both date and time to string before concatenating
-        df_result['datetime'] = pd.to_datetime(df_result['Entry Date'].astype(str) + ' ' + df_result['Entry Time'].astype(str))
-        df_result = df_result.sort_values('datetime').drop('datetime', axis=1)
+        # Trades from the PDFs are ISO 'YYYY-MM-DD' / 'HH:MM:SS' strings, which sort chronologically as text;
+        # mergesort is stable, so same-second lots keep the order they were opened in
+        df_result = df_result.sort_values(['Entry Date', 'Entry Time'], kind='mergesort')
     
     return df_result
 
@@ -577,18 +559,13 @@ def update_master_sheet(consolidated_trades, folder_path):
         # Create backup of current master file
         if os.path.exists(master_file):
             print(f"\n📑 Creating backup of master sheet...")
-            # Read existing workbook with all sheets
-            with pd.ExcelFile(master_file) as xls:
-                all_sheets = {}
-                for sheet_name in xls.sheet_names:
-                    all_sheets[sheet_name] = pd.read_excel(xls, sheet_name=sheet_name)
-            
-            # Save backup with all sheets
-            with pd.ExcelWriter(backup_file, engine='openpyxl') as writer:
-                for sheet_name, df in all_sheets.items():
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            # Plain file copy; no need to round-trip the workbook through pandas
+            shutil.copy2(master_file, backup_file)
             print(f"✅ Backup created: {os.path.basename(MASTER_BACKUP)}")
             
+            # Read existing workbook with all sheets
+            all_sheets = pd.read_excel(master_file, sheet_name=None)
+            
             # Load existing sheets with proper names - handle both old and new sheet names
             df_master = pd.DataFrame()
             df_raw_trades = pd.DataFrame()
@@ -652,6 +629,11 @@ def update_master_sheet(consolidated_trades, folder_path):
         print(f"   - Raw Trades sheet: {len(df_raw_trades)} rows")
         print(f"   - Consolidated Trades sheet: {len(df_consolidated)} rows")
         
+        # Keys of trades already in each sheet: tuples of the stringified fields, checked with set lookups
+        position_keys = set()
+        raw_trade_keys = set()
+        consolidated_keys = set()
+        
         # Create unique identifier for existing trades in master sheet
         if not df_master.empty:
             # Check which column names exist and use them
@@ -672,17 +654,11 @@ def update_master_sheet(consolidated_trades, folder_path):
             
             # Only create trade keys if we have all required columns
             if all(col is not None for col in [qty_col, side_col, price_col, time_col, date_col]):
-                df_master['trade_key'] = (
-                    df_master['Symbol'].astype(str) + '_' + 
-                    df_master[qty_col].astype(str) + '_' + 
-                    df_master[side_col].astype(str) + '_' + 
-                    df_master[price_col].astype(str) + '_' + 
-                    df_master[time_col].astype(str) + '_' + 
-                    df_master[date_col].astype(str)
-                )
+                position_keys = set(zip(*(
+                    df_master[col].astype(str) for col in ['Symbol', qty_col, side_col, price_col, time_col, date_col]
+                )))
             else:
                 print(f"⚠️ Warning: Missing required columns in master sheet. Skipping trade key creation.")
-                df_master['trade_key'] = ''
         
         # Create unique identifier for existing trades in raw trades sheet
         if not df_raw_trades.empty:
@@ -698,17 +674,12 @@ def update_master_sheet(consolidated_trades, folder_path):
                 # If neither exists, we have a problem with the data structure
                 print(f"⚠️ Warning: No 'Side' or 'Type' column found in Raw Trades. Available columns: {list(df_raw_trades.columns)}")
                 # Skip creating trade keys for raw trades if we can't identify the side column
-                df_raw_trades['trade_key'] = ''
+                side_col = None
             
-            if 'trade_key' not in df_raw_trades.columns:
-                df_raw_trades['trade_key'] = (
-                    df_raw_trades['Symbol'].astype(str) + '_' + 
-                    df_raw_trades['Date'].astype(str) + '_' + 
-                    df_raw_trades['Time'].astype(str) + '_' + 
-                    df_raw_trades[side_col].astype(str) + '_' + 
-                    df_raw_trades[qty_col].astype(str) + '_' + 
-                    df_raw_trades['Price'].astype(str)
-                )
+            if side_col is not None:
+                raw_trade_keys = set(zip(*(
+                    df_raw_trades[col].astype(str) for col in ['Symbol', 'Date', 'Time', side_col, qty_col, 'Price']
+                )))
         
         # Create unique identifier for existing consolidated trades
         if not df_consolidated.empty:
@@ -719,14 +690,12 @@ def update_master_sheet(consolidated_trades, folder_path):
                 side_col = 'Type'
             else:
                 print(f"⚠️ Warning: No 'Side' or 'Type' column found in Consolidated Trades. Available columns: {list(df_consolidated.columns)}")
-                df_consolidated['trade_key'] = ''
+                side_col = None
             
-            if 'trade_key' not in df_consolidated.columns:
-                df_consolidated['trade_key'] = (
-                    df_consolidated['Symbol'].astype(str) + '_' + 
-                    df_consolidated['Processed'].astype(str) + '_' + 
-                    df_consolidated[side_col].astype(str)
-                )
+            if side_col is not None and 'Processed' in df_consolidated.columns:
+                consolidated_keys = set(zip(*(
+                    df_consolidated[col].astype(str) for col in ['Symbol', 'Processed', side_col]
+                )))
         
         # Track new trades for all sheets
         new_position_trades = []
@@ -735,66 +704,61 @@ def update_master_sheet(consolidated_trades, folder_path):
         # Group consolidated trades by symbol, date, and side for the consolidated sheet
         consolidated_by_day = {}
         
-        for trade in consolidated_trades:
-            # Create trade keys
-            position_trade_key = (
-                f"{trade['Symbol']}_{trade['Quantity']}_{trade['Side']}_"
-                f"{trade['Price']}_{trade['Time']}_{trade['Date']}"
-            )
-            
-            raw_trade_key = (
-                f"{trade['Symbol']}_{trade['Date']}_{trade['Time']}_{trade['Side']}_"
-                f"{trade['Quantity']}_{trade['Price']}"
-            )
+        # Normalise every trade date in one vectorised parse instead of once per dict literal
+        entry_dates = pd.to_datetime(
+            [trade['Date'] for trade in consolidated_trades], format='ISO8601'
+        ).strftime('%Y-%m-%d')
+        
+        for trade, entry_date in zip(consolidated_trades, entry_dates):
+            # Read each field once; the keys, group totals and new rows below all reuse these locals
+            symbol, qty, side = trade['Symbol'], trade['Quantity'], trade['Side']
+            price, time = trade['Price'], trade['Time']
+            symbol_s, qty_s, side_s = str(symbol), str(qty), str(side)
+            price_s, time_s, date_s = str(price), str(time), str(trade['Date'])
             
-            consolidated_trade_key = f"{trade['Symbol']}_{trade['Date']}_{trade['Side']}"
+            # Create trade keys (same field order as the existing-sheet keys above)
+            position_trade_key = (symbol_s, qty_s, side_s, price_s, time_s, date_s)
+            raw_trade_key = (symbol_s, date_s, time_s, side_s, qty_s, price_s)
+            consolidated_trade_key = (symbol_s, date_s, side_s)
             
             # Add to raw trades sheet if not already exists
-            if df_raw_trades.empty or raw_trade_key not in df_raw_trades['trade_key'].values:
+            if raw_trade_key not in raw_trade_keys:
                 new_raw_trade = {
-                    "Symbol": trade['Symbol'],
-                    "Quantity": trade['Quantity'],
-                    "Side": trade['Side'],  # Add the missing Side column
-                    "Price": trade['Price'],
-                    "Time": trade['Time'],
-                    "Date": pd.to_datetime(trade['Date']).strftime('%Y-%m-%d')
+                    "Symbol": symbol,
+                    "Quantity": qty,
+                    "Side": side,  # Add the missing Side column
+                    "Price": price,
+                    "Time": time,
+                    "Date": entry_date
                 }
                 new_raw_trades.append(new_raw_trade)
+                raw_trade_keys.add(raw_trade_key)
             
             # Group for consolidated trades sheet (by symbol, date, side)
-            if consolidated_trade_key not in consolidated_by_day:
-                consolidated_by_day[consolidated_trade_key] = {
-                    "Symbol": trade['Symbol'],
-                    "Date": pd.to_datetime(trade['Date']).strftime('%Y-%m-%d'),
-                    "Side": trade['Side'],
+            group = consolidated_by_day.get(consolidated_trade_key)
+            if group is None:
+                group = consolidated_by_day[consolidated_trade_key] = {
+                    "Symbol": symbol,
+                    "Date": entry_date,
+                    "Side": side,
                     "total_qty": 0,
-                    "total_value": 0,
-                    "time": trade['Time']  # Initialize with first trade's time
+                    "total_value": 0
                 }
             
-            group = consolidated_by_day[consolidated_trade_key]
-            group['total_qty'] += trade['Quantity']
-            group['total_value'] += trade['Quantity'] * trade['Price']
-            
-            # Update time based on trade side:
-            # LONG: keep earliest time
-            # SHORT: keep latest time
-            if trade['Side'] == 'LONG':
-                group['time'] = min(group['time'], trade['Time'])
-            else:  # SHORT
-                group['time'] = max(group['time'], trade['Time'])
+            group['total_qty'] += qty
+            group['total_value'] += qty * price
             
             # Add LONG positions to master sheet for position tracking
-            if trade['Side'] in ['BUY', 'LONG']:
+            if side in ('BUY', 'LONG'):
                 # Check if trade already exists in master
-                if df_master.empty or position_trade_key not in df_master['trade_key'].values:
+                if position_trade_key not in position_keys:
                     new_trade = {
-                        "Symbol": trade['Symbol'],
-                        "Qty": trade['Quantity'],
+                        "Symbol": symbol,
+                        "Qty": qty,
                         "Side": 'LONG',
-                        "Entry Price": trade['Price'],
-                        "Entry Time": trade['Time'],
-                        "Entry Date": pd.to_datetime(trade['Date']).strftime('%Y-%m-%d'),
+                        "Entry Price": price,
+                        "Entry Time": time,
+                        "Entry Date": entry_date,
                         "Notes": "",
                         "Exit Qty": None,
                         "Exit Price": None,
@@ -802,12 +766,13 @@ def update_master_sheet(consolidated_trades, folder_path):
                         "Exit Date": None
                     }
                     new_position_trades.append(new_trade)
+                    position_keys.add(position_trade_key)
         
         # Create new consolidated trades for the consolidated sheet
         new_consolidated_trades = []
         for key, group in consolidated_by_day.items():
             # Check if this consolidated trade already exists
-            if df_consolidated.empty or key not in df_consolidated['trade_key'].values:
+            if key not in consolidated_keys:
                 # Fix the average price calculation for SHORT positions
                 if group['total_qty'] != 0:
                     avg_price = abs(group['total_value'] / group['total_qty'])
@@ -819,7 +784,7 @@ def update_master_sheet(consolidated_trades, folder_path):
                     "Quantity": group['total_qty'],
                     "Side": group['Side'],
                     "Avg_Price": avg_price,
-                    "Processed": pd.to_datetime(group['Date']).strftime('%Y-%m-%d')  # Using Date as Processed
+                    "Processed": group['Date']  # Using Date as Processed (already YYYY-MM-DD)
                 }
                 
                 new_consolidated_trades.append(new_consolidated_trade)
@@ -837,7 +802,7 @@ def update_master_sheet(consolidated_trades, folder_path):
             df_new_consolidated = pd.DataFrame(new_consolidated_trades)
             df_consolidated = pd.concat([df_consolidated, df_new_consolidated], ignore_index=True)
         
-        # Drop the temporary trade_key columns before saving
+        # Drop any trade_key columns a previous save left in the sheets
         df_master = df_master.drop('trade_key', axis=1, errors='ignore')
         df_raw_trades = df_raw_trades.drop('trade_key', axis=1, errors='ignore')
         df_consolidated = df_consolidated.drop('trade_key', axis=1, errors='ignore')
@@ -856,16 +821,15 @@ def update_master_sheet(consolidated_trades, folder_path):
                 'Date': 'Entry Date'
             }
             
-            for old_name, new_name in column_mapping.items():
-                if old_name in df_master.columns and new_name not in df_master.columns:
-                    df_master = df_master.rename(columns={old_name: new_name})
+            renames = {
+                old_name: new_name for old_name, new_name in column_mapping.items()
+                if old_name in df_master.columns and new_name not in df_master.columns
+            }
+            if renames:
+                df_master = df_master.rename(columns=renames)
         
-        # Final sort and cleanup for master sheet
+        # Final cleanup for master sheet; match_trades_fifo already returns it sorted by entry date and time
         if not df_master.empty:
-            # Convert time to string before concatenating, using mixed format for flexibility
-            df_master['datetime'] = pd.to_datetime(df_master['Entry Date'].astype(str) + ' ' + df_master['Entry Time'].astype(str), format='mixed', errors='coerce')
-            df_master = df_master.sort_values('datetime').drop('datetime', axis=1)
-            
             # Remove any duplicate rows
             df_master = df_master.drop_duplicates(
                 subset=['Symbol', 'Qty', 'Side', 'Entry Price', 'Entry Time', 'Entry Date'],
@@ -874,18 +838,13 @@ def update_master_sheet(consolidated_trades, folder_path):
         
         # Sort raw trades sheet by date and time
         if not df_raw_trades.empty:
-            # Convert both date and time to string before concatenating, using mixed format for flexibility
-            df_raw_trades['datetime'] = pd.to_datetime(df_raw_trades['Date'].astype(str) + ' ' + df_raw_trades['Time'].astype(str), format='mixed', errors='coerce')
-            df_raw_trades = df_raw_trades.sort_values('datetime').drop('datetime', axis=1)
-        
-        # Sort consolidated trades sheet by date
-        # Create unique identifier for existing consolidated trades
-        if not df_consolidated.empty:
-            df_consolidated['trade_key'] = (
-                df_consolidated['Symbol'].astype(str) + '_' + 
-                df_consolidated['Date'].astype(str) + '_' + 
-                df_consolidated['Side'].astype(str)
+            # Date/Time are ISO 'YYYY-MM-DD' / 'HH:MM:SS' strings, so sort them as text instead of parsing;
+            # older rows can come back as real Excel dates ('YYYY-MM-DD 00:00:00'), so compare the day part only
+            df_raw_trades = df_raw_trades.sort_values(
+                ['Date', 'Time'], kind='mergesort',
+                key=lambda col: col.astype(str).str[:10] if col.name == 'Date' else col.astype(str)
             )
+        
         # Save updated master file with proper sheet names
         with pd.ExcelWriter(master_file, engine='openpyxl') as writer:
             df_master.to_excel(writer, sheet_name='Trades', index=False)  # Position tracking
@@ -903,30 +862,33 @@ def update_master_sheet(consolidated_trades, folder_path):
         print(f"   - Raw Trades sheet: {len(df_raw_trades)} rows")
         print(f"   - Consolidated Trades sheet: {len(df_consolidated)} rows")
         
+        return df_master
+        
     except Exception as e:
         print(f"❌ Error updating master sheet: {str(e)}")
         import traceback
         traceback.print_exc()
 
-def manage_processed_files(folder_path, pdf_file=None, check_only=False):
-    """Track processed PDF files using a JSON file"""
+def manage_processed_files(folder_path, pdf_files=(), check_only=False):
+    """Track processed PDF files using a JSON file; returns the set of processed file names"""
     tracking_file = os.path.join(folder_path, PROCESSED_FILE)  # Use test file if in test mode
     
     # Load existing processed files
     if os.path.exists(tracking_file):
         with open(tracking_file, 'r') as f:
-            processed_files = json.load(f)
+            processed_files = set(json.load(f))
     else:
-        processed_files = []
+        processed_files = set()
     
     if check_only:
         return processed_files
     
-    # Add new file and save
-    if pdf_file and pdf_file not in processed_files:
-        processed_files.append(pdf_file)
+    # Add new files and save once; sorted so the JSON stays in date order
+    new_files = set(pdf_files) - processed_files
+    if new_files:
+        processed_files |= new_files
         with open(tracking_file, 'w') as f:
-            json.dump(processed_files, f, indent=2)
+            json.dump(sorted(processed_files), f, indent=2)
     
     return processed_files
 
@@ -964,17 +926,11 @@ def reset_master_sheet():
         # Create backup before reset
         if os.path.exists(master_file):
             print(f"📑 Creating backup before reset...")
-            with pd.ExcelFile(master_file) as xls:
-                all_sheets = {}
-                for sheet_name in xls.sheet_names:
-                    all_sheets[sheet_name] = pd.read_excel(xls, sheet_name=sheet_name)
             
-            # Save backup with timestamp
+            # Save backup with timestamp; a straight file copy, no need to parse and rewrite every sheet
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             reset_backup = os.path.join(BASE_PATH, f"master_pre_reset_{timestamp}.xlsx")
-            with pd.ExcelWriter(reset_backup, engine='openpyxl') as writer:
-                for sheet_name, df in all_sheets.items():
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            shutil.copy2(master_file, reset_backup)
             print(f"✅ Pre-reset backup created: {os.path.basename(reset_backup)}")
         
         # Create fresh empty sheets with headers only
@@ -1000,15 +956,13 @@ def reset_master_sheet():
         
         # Reset all processed_files.json in subdirectories
         reset_count = 0
-        for root, dirs, files in os.walk(BASE_PATH):
-            processed_file = os.path.join(root, "processed_files.json")
-            if os.path.exists(processed_file):
-                # Clear the processed files list
-                with open(processed_file, 'w') as f:
-                    json.dump([], f, indent=2)
-                reset_count += 1
-                rel_path = os.path.relpath(root, BASE_PATH)
-                print(f"   📂 Reset processed files in: {rel_path}")
+        for processed_file in glob.iglob(os.path.join(BASE_PATH, '**', "processed_files.json"), recursive=True):
+            # Clear the processed files list
+            with open(processed_file, 'w') as f:
+                json.dump([], f, indent=2)
+            reset_count += 1
+            rel_path = os.path.relpath(os.path.dirname(processed_file), BASE_PATH)
+            print(f"   📂 Reset processed files in: {rel_path}")
         
         # Remove backup file if it exists
         if os.path.exists(backup_file):
@@ -1034,9 +988,11 @@ def process_folder(date_str):
             reset_test_files(folder_path)
         
         # Get all trades from PDFs in the folder
-        all_trades = gather_all_trades(folder_path)
+        all_trades, new_reports = gather_all_trades(folder_path)
         
-        if not all_trades:
+        if all_trades.empty:
+            # Reports without trades have nothing to save; mark them so they are not parsed again
+            manage_processed_files(folder_path, new_reports)
             print("No new trades found to process.")
             return
         
@@ -1048,10 +1004,15 @@ def process_folder(date_str):
         print(f"   - Consolidated trades: {len(consolidated_trades)}")
         
         # Update master sheet with consolidated trades
-        update_master_sheet(consolidated_trades, folder_path)
+        df_master = update_master_sheet(consolidated_trades, folder_path)
+        
+        # Only mark the reports as processed once their trades are in the master workbook,
+        # so a failed run parses them again next time
+        if df_master is not None:
+            manage_processed_files(folder_path, new_reports)
         
         # Check and display open positions
-        check_open_positions(folder_path)
+        check_open_positions(folder_path, df_master)
         
     except (FileNotFoundError, ValueError) as e:
         print(f"❌ Error: {str(e)}")
@@ -1064,7 +1025,7 @@ def main():
     print("=" * 60)
     
     # Get current month/year as default
-    current_month_year = datetime.now().strftime("%m.%Y")
+    current_month_year = f"{today:%m.%Y}"
     
     choice = input(f"\n'RESET' or enter a date (default: {current_month_year}): ").strip()
     